@@ -8,7 +8,7 @@ import json
 script_path = os.path.realpath(os.path.dirname(__file__))
 
 with open(f"{script_path}/collections/mm2_dev.postman_collection.json", 'r') as f:
-    for line in f.readlines():
+    for line in f:
         l = line.strip()
         if len(l) > 40:
             if l.startswith('"raw": "'):
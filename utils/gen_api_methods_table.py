@@ -1,71 +1,77 @@
 #!/usr/bin/env python3
 import os
-import glob
+import re
 
 script_path = os.path.dirname(os.path.realpath(__file__))
 root_path = os.path.dirname(script_path)
+pages_path = f'{root_path}/src/pages'
+template_path = f'{script_path}/methods_table.template'
+api_pages_path = f'{pages_path}/komodo-defi-framework/api'
+methods_table_path = f'{api_pages_path}/index.mdx'
+underscore_escape_table = str.maketrans({"_": "\\_"})
+code_group_label_re = re.compile(r'CodeGroup.*?label="([^"]*)"')
+code_group_title_re = re.compile(r'title="([^"]*)"')
+
+def find_index_files(path):
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        if 'index.mdx' in filenames:
+            yield os.path.join(dirpath, 'index.mdx')
 
 def gen_api_methods_table():
-    komodefi_files = glob.glob(f'{root_path}/src/pages/komodo-defi-framework/**/index.mdx', recursive = True)
     methods_dict = {
-        "legacy": [],
-        "v20": [],
-        "v20-dev": []
+        "legacy": {},
+        "v20": {},
+        "v20-dev": {}
     }
-    methods_list = []
-    for file in komodefi_files:
-        with open(file, 'r') as f:
-            for line in f.readlines():
-                doc_path = file.replace(f'{root_path}/src/pages', '').replace('/index.mdx', '')
-                doc_split = doc_path.split('/')
-                if len(doc_split) > 3:
-                    section = doc_split[3]
-                    if section in methods_dict:
-                        if 'CodeGroup' in line and "label" in line:
-                            method = line.split('label="')[1].split('"')[0]
-                            hash_link = line.split('title="')[1].split('"')[0].replace(" ", "-").lower()
-                            if hash_link == "":
-                                hash_link = method.replace("_", "-").split("::")[-1].lower()
-                            link = f"[{method}]({doc_path}/#{hash_link})"
-                            methods_dict[section].append({
-                                "link": link,
-                                "method": method,
-                                "doc_url": doc_path
-                            })
-                            methods_list.append(method)
-    methods_list = sorted(list(set(methods_list)))
+    methods = set()
+    for section, section_methods in methods_dict.items():
+        for file in find_index_files(f'{api_pages_path}/{section}'):
+            doc_path = file.replace(pages_path, '').replace('/index.mdx', '')
+            with open(file, 'r') as f:
+                for line in f:
+                    code_group = code_group_label_re.search(line)
+                    if code_group:
+                        method = code_group.group(1)
+                        title = code_group_title_re.search(line)
+                        if title is None:
+                            raise ValueError(f'{file}: CodeGroup "{method}" has no title attribute')
+                        hash_link = title.group(1).replace(" ", "-").lower()
+                        if hash_link == "":
+                            hash_link = method.replace("_", "-").split("::")[-1].lower()
+                        link = f"[{method}]({doc_path}/#{hash_link})"
+                        section_methods[method] = link
+                        methods.add(method)
 
-    with open(f'{script_path}/methods_table.template', 'r') as f:
+    with open(template_path, 'r') as f:
         template = f.read()
-        with open(f'{root_path}/src/pages/komodo-defi-framework/api/index.mdx', 'w') as f2:
-            f2.write(template)
-            for method in methods_list:
-                legacy = ""
-                v20 = ""
-                v20_dev = ""
-                for i in methods_dict.keys():
-                    for j in methods_dict[i]:
-                        if j["method"] == method:
-                            if i == "legacy":
-                                legacy = j["link"]
-                            if i == "v20":
-                                v20 = j["link"]
-                            if i == "v20-dev":
-                                v20_dev = j["link"]
-                legacy = escape_underscores(legacy)
-                v20 = escape_underscores(v20)
-                v20_dev = escape_underscores(v20_dev)
-                line = "| {:^108} | {:^108} | {:^108} |".format(legacy, v20, v20_dev)
-                f2.write(f"{line}\n")
+
+    lines = [template]
+    for method in sorted(methods):
+        legacy = escape_underscores(methods_dict["legacy"].get(method, ""))
+        v20 = escape_underscores(methods_dict["v20"].get(method, ""))
+        v20_dev = escape_underscores(methods_dict["v20-dev"].get(method, ""))
+        lines.append("| {:^108} | {:^108} | {:^108} |\n".format(legacy, v20, v20_dev))
+
+    write_if_changed(methods_table_path, "".join(lines))
+
+def write_if_changed(path, content):
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            if f.read() == content:
+                return
+    tmp_path = f'{path}.tmp'
+    try:
+        with open(tmp_path, 'w') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 def escape_underscores(s):
-    output = ""
-    for letter in s:
-        if letter == "_":
-            output += "\\_"
-        else:
-            output += letter
-    return output
+    return s.translate(underscore_escape_table)
 
 if __name__ == '__main__':
     gen_api_methods_table()